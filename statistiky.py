@@ -5,13 +5,27 @@ Calculates statistics from firefighting event data exported from the system.
 """
 
 import json
-from datetime import datetime, timezone, timedelta
+import functools
+import gzip
+import heapq
+import os
+from datetime import datetime, date, timezone, timedelta
+from bisect import bisect_right
 from collections import defaultdict, Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
 import csv
-import urllib.request
+import re
 import urllib.parse
 import sys
+import time
+import warnings
+from types import SimpleNamespace
+from calendar import timegm
+
+# datetime.fromisoformat accepts the trailing 'Z' since Python 3.11
+FROMISOFORMAT_ACCEPTS_Z = sys.version_info >= (3, 11)
 
 try:
     from zoneinfo import ZoneInfo
@@ -26,39 +40,100 @@ except ImportError:
         PYTZ_AVAILABLE = False
 
 try:
-    import matplotlib
-    matplotlib.use('Agg')  # Use non-interactive backend
-    import matplotlib.pyplot as plt
-    import matplotlib.dates as mdates
-    MATPLOTLIB_AVAILABLE = True
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import ijson
+    # Streaming only pays off with a compiled backend, the pure Python one is very slow
+    IJSON_AVAILABLE = ijson.backend != 'python'
 except ImportError:
-    MATPLOTLIB_AVAILABLE = False
+    IJSON_AVAILABLE = False
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Larger events files are streamed with ijson, loading them at once is faster
+# but needs several times the file size in memory
+STREAM_MIN_SIZE = 128 * 1024 * 1024
+
+# Acronyms that should remain uppercase in formatted names
+ACRONYMS = ['LDN', 'ZOC', 'OS', 'ZPP', 'SSU', 'VZ', 'IVC', 'HZS', 'SDL', 'NVZ', 'PRM', 'AED']
+# Match whole words only (surrounded by spaces, commas, or at start/end)
+_ACRONYM_RE = re.compile(r'\b(' + '|'.join(ACRONYMS) + r')\b', re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=None)
+def _import_pyplot():
+    """Import matplotlib only when plots are exported, returns None if it is not installed."""
+    try:
+        import matplotlib
+        matplotlib.use('Agg')  # Use non-interactive backend
+        import matplotlib.pyplot as plt
+    except ImportError:
+        return None
+    return plt
+
+
+def _render_plots(output_dir, plots, fast=False, verbose=False):
+    """
+    Render plots as PNG images into output_dir, reusing one figure for all of them.
+
+    plots are (filename, figure size, drawing function, data) tuples, the drawing
+    function is called as draw(ax, data). Used by export_plots, also in worker processes.
+    With fast, PNGs are compressed with the fastest zlib level (larger files).
+    """
+    plt = _import_pyplot()
+    # Set Czech font if available, otherwise use default
+    plt.rcParams['font.family'] = 'DejaVu Sans'
+    plt.rcParams['font.size'] = 10
+
+    pil_kwargs = {'compress_level': 1} if fast else None
+    fig = plt.figure()
+    for filename, size, draw, data in plots:
+        fig.clear()
+        fig.set_size_inches(*size)
+        draw(fig.add_subplot(), data)
+        fig.tight_layout()
+        fig.savefig(Path(output_dir) / filename, dpi=150, bbox_inches='tight', pil_kwargs=pil_kwargs)
+        if verbose:
+            print(f"  ✓ {filename}")
+    plt.close(fig)
 
 
 class EventStatistics:
+    __slots__ = ('_events', 'types', 'subtypes', 'states', '_events_file', '_columns')
+
     BASE_URL = 'http://webohled.hzsmsk.cz/api'
+    # Downloaded types and subtypes are kept on disk for a day, they rarely change
+    ENUMERATOR_CACHE_TTL = 24 * 60 * 60
     # Backend stores times in CET/CEST but marks them as UTC
     BACKEND_TIMEZONE = 'Europe/Prague'
+    # Czech timezone, created once at import. Without zoneinfo and pytz assume
+    # CET (UTC+1) without DST handling, this is not perfect but works for most cases
+    _PRAGUE_TZ = (ZoneInfo(BACKEND_TIMEZONE) if ZONEINFO_AVAILABLE
+                  else pytz.timezone(BACKEND_TIMEZONE) if PYTZ_AVAILABLE
+                  else timezone(timedelta(hours=1)))
 
     def __init__(self, events_file='udalosti.json', types_file='typy.json', subtypes_file='podtypy.json', states_file='stavy.json'):
         """Initialize with data files."""
-        self.events = self._load_json(events_file)
+        self._events_file = events_file
+        self._columns = None
+        if IJSON_AVAILABLE and os.path.getsize(events_file) > STREAM_MIN_SIZE:
+            # Large events files are streamed by iter_events() instead of being
+            # loaded at once, events are only loaded when they are accessed
+            self._events = None
+        else:
+            self._events = self._load_json(events_file)
         self.types = {t['id']: self._format_name(t['nazev']) for t in self._load_json(types_file)}
         self.subtypes = {s['id']: self._format_name(s['nazev']) for s in self._load_json(subtypes_file)}
         self.states = {s['id']: self._format_name(s['nazev']) for s in self._load_json(states_file)}
 
-    @staticmethod
-    def _get_prague_tz():
-        """Get Prague timezone object."""
-        if ZONEINFO_AVAILABLE:
-            return ZoneInfo('Europe/Prague')
-        elif PYTZ_AVAILABLE:
-            return pytz.timezone('Europe/Prague')
-        else:
-            # Fallback: assume CET (UTC+1) without DST handling
-            # This is not perfect but works for most cases
-            return timezone(timedelta(hours=1))
-
     @classmethod
     def _local_to_utc(cls, dt_str):
         """
@@ -74,13 +149,11 @@ class EventStatistics:
             dt = datetime.fromisoformat(dt_str)
 
         # Make it timezone-aware in Prague time
-        prague_tz = cls._get_prague_tz()
-
         if ZONEINFO_AVAILABLE or PYTZ_AVAILABLE:
             if ZONEINFO_AVAILABLE:
-                dt_local = dt.replace(tzinfo=prague_tz)
+                dt_local = dt.replace(tzinfo=cls._PRAGUE_TZ)
             else:  # pytz
-                dt_local = prague_tz.localize(dt)
+                dt_local = cls._PRAGUE_TZ.localize(dt)
 
             # Convert to UTC
             dt_utc = dt_local.astimezone(timezone.utc)
@@ -97,15 +170,8 @@ class EventStatistics:
 
         Example: 2024-12-31 23:00 UTC -> 2025-01-01 00:00 CET
         """
-        prague_tz = cls._get_prague_tz()
-
-        if ZONEINFO_AVAILABLE or PYTZ_AVAILABLE:
-            # Convert to Prague time
-            dt_local = dt_utc.astimezone(prague_tz)
-            return dt_local
-        else:
-            # Simple fallback: add 1 hour (doesn't handle DST)
-            return dt_utc + timedelta(hours=1)
+        # Without zoneinfo and pytz this is a fixed +1 hour (doesn't handle DST)
+        return dt_utc.astimezone(cls._PRAGUE_TZ)
 
     @staticmethod
     def _format_name(name):
@@ -113,9 +179,6 @@ class EventStatistics:
         if not name:
             return name
 
-        # List of acronyms that should remain uppercase
-        acronyms = ['LDN', 'ZOC', 'OS', 'ZPP', 'SSU', 'VZ', 'IVC', 'HZS', 'SDL', 'NVZ', 'PRM', 'AED']
-
         # Convert to lowercase first
         formatted = name.lower()
 
@@ -123,13 +186,7 @@ class EventStatistics:
         formatted = formatted[0].upper() + formatted[1:]
 
         # Restore acronyms to uppercase
-        for acronym in acronyms:
-            # Match whole words only (surrounded by spaces, commas, or at start/end)
-            import re
-            pattern = r'\b' + acronym.lower() + r'\b'
-            formatted = re.sub(pattern, acronym, formatted, flags=re.IGNORECASE)
-
-        return formatted
+        return _ACRONYM_RE.sub(lambda m: m.group(1).upper(), formatted)
 
     @classmethod
     def from_web(cls, from_date, to_date, unit_id, save_to_files=False):
@@ -144,15 +201,17 @@ class EventStatistics:
         """
         print("Stahuji data z webu...")
 
-        # Download enumerator files
-        print("  Stahuji typy...")
-        types_data = cls._download_json(f'{cls.BASE_URL}/typy')
-
-        print("  Stahuji podtypy...")
-        subtypes_data = cls._download_json(f'{cls.BASE_URL}/podtypy')
-
-        print("  Stahuji stavy...")
-        states_data = cls._download_json(f'{cls.BASE_URL}/stavy')
+        # Download enumerator files, the requests are independent so run them concurrently
+        print("  Stahuji typy, podtypy a stavy...")
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            types_future = executor.submit(cls._download_enumerator_json, f'{cls.BASE_URL}/typy')
+            subtypes_future = executor.submit(cls._download_enumerator_json, f'{cls.BASE_URL}/podtypy')
+            # States are always downloaded fresh, the events query below is filtered
+            # by their IDs and a stale list would silently drop events
+            states_future = executor.submit(cls._download_json, f'{cls.BASE_URL}/stavy')
+            types_data = types_future.result()
+            subtypes_data = subtypes_future.result()
+            states_data = states_future.result()
 
         # Get all state IDs for the events query
         state_ids = [s['id'] for s in states_data]
@@ -206,6 +265,7 @@ class EventStatistics:
 
         # Create instance with downloaded data
         instance = cls.__new__(cls)
+        instance._events_file = None
         instance.events = events_data
         instance.types = {t['id']: cls._format_name(t['nazev']) for t in types_data}
         instance.subtypes = {s['id']: cls._format_name(s['nazev']) for s in subtypes_data}
@@ -216,187 +276,419 @@ class EventStatistics:
     @staticmethod
     def _download_json(url):
         """Download JSON data from URL."""
+        # Imported here, runs from local files don't need it
+        import urllib.request
+
         with urllib.request.urlopen(url) as response:
+            if ORJSON_AVAILABLE:
+                return orjson.loads(response.read())
             return json.loads(response.read().decode('utf-8'))
 
+    @staticmethod
+    def _enumerator_cache_dir():
+        """Return the directory for cached enumerators, or None if there is no home directory."""
+        try:
+            return Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'sdh_stats'
+        except (RuntimeError, KeyError):
+            return None
+
+    @classmethod
+    @functools.lru_cache(maxsize=32)
+    def _download_enumerator_json(cls, url):
+        """
+        Download enumerator JSON data (types, subtypes) from URL.
+
+        Enumerators rarely change, so responses are cached for the lifetime of
+        the process and on disk in _enumerator_cache_dir() for ENUMERATOR_CACHE_TTL
+        seconds. The returned data is shared and must not be modified.
+        """
+        cache_dir = cls._enumerator_cache_dir()
+        if cache_dir is None:
+            return cls._download_json(url)
+
+        cache_file = cache_dir / f"{url.rstrip('/').rsplit('/', 1)[-1]}.json"
+        try:
+            if time.time() - cache_file.stat().st_mtime < cls.ENUMERATOR_CACHE_TTL:
+                return cls._load_json(cache_file)
+        except (OSError, ValueError):
+            # Missing or broken cache file, download again
+            pass
+
+        data = cls._download_json(url)
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            cls._save_json(cache_file, data)
+        except OSError:
+            # The cache is optional, e.g. the home directory may be read-only
+            pass
+        return data
+
     @staticmethod
     def _save_json(filename, data):
         """Save JSON data to file."""
+        if ORJSON_AVAILABLE:
+            # orjson writes UTF-8 without escaping, same as ensure_ascii=False
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+            return
         with open(filename, 'w', encoding='utf-8') as f:
             json.dump(data, f, ensure_ascii=False, indent=2)
 
-    def _load_json(self, filename):
+    @staticmethod
+    def _load_json(filename):
         """Load JSON file."""
+        if ORJSON_AVAILABLE:
+            # orjson parses bytes directly and is several times faster than json
+            with open(filename, 'rb') as f:
+                return orjson.loads(f.read())
         with open(filename, 'r', encoding='utf-8') as f:
             return json.load(f)
 
-    def _parse_datetime(self, date_str):
-        """Parse ISO datetime string and convert to Czech local time."""
-        if date_str:
-            dt_utc = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-            # Convert UTC to Czech local time for analysis
-            return self._utc_to_local(dt_utc)
-        return None
+    @staticmethod
+    def _parse_timestamp(date_str):
+        """Parse ISO datetime string to UTC seconds since epoch, naive strings are taken as UTC."""
+        if not FROMISOFORMAT_ACCEPTS_Z:
+            date_str = date_str.replace('Z', '+00:00')
+        dt = datetime.fromisoformat(date_str)
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return int(dt.timestamp())
+
+    @classmethod
+    def _parse_timestamps(cls, date_strs):
+        """
+        Parse ISO datetime strings to UTC seconds since epoch, an int64 array
+        when numpy is available and a list otherwise.
+        """
+        parse_timestamp = cls._parse_timestamp
+        if not NUMPY_AVAILABLE:
+            return [parse_timestamp(s) for s in date_strs]
+
+        if date_strs:
+            with warnings.catch_warnings():
+                # numpy warns instead of failing on timezone aware strings (UserWarning in 2.x,
+                # DeprecationWarning in 1.x), treat them as unparseable
+                warnings.simplefilter('error')
+                try:
+                    # Parsed in C, naive strings are taken as UTC like in _parse_timestamp
+                    return np.array([s.rstrip('Z') for s in date_strs], dtype='datetime64[us]') \
+                        .astype('datetime64[s]').astype(np.int64)
+                except (ValueError, Warning):
+                    pass
+        return np.array([parse_timestamp(s) for s in date_strs], dtype=np.int64)
+
+    @classmethod
+    def _utc_offset_table(cls, first_second, last_second):
+        """
+        Precompute Czech local time UTC offsets for a range of UTC epoch seconds.
+
+        Returns (transitions, offsets), offsets[i] applies to times between
+        transitions[i - 1] and transitions[i], i.e. the offset of time t is
+        offsets[bisect_right(transitions, t)].
+        """
+        def offset(sec):
+            local = cls._utc_to_local(datetime.fromtimestamp(sec, timezone.utc))
+            return timegm(local.timetuple()) - sec
+
+        transitions = []
+        offsets = [offset(first_second)]
+        # Offset changes at most twice a year, sample daily and bisect to the exact second
+        sec = first_second
+        while sec < last_second:
+            next_sec = min(sec + 86400, last_second)
+            if offset(next_sec) != offsets[-1]:
+                low, high = sec, next_sec
+                while high - low > 1:
+                    middle = (low + high) // 2
+                    if offset(middle) == offsets[-1]:
+                        low = middle
+                    else:
+                        high = middle
+                transitions.append(high)
+                offsets.append(offset(high))
+            sec = next_sec
+        return transitions, offsets
+
+    @classmethod
+    def _to_local_seconds(cls, utc_seconds):
+        """
+        Convert UTC epoch seconds to Czech local wall clock time, again as seconds
+        since epoch (i.e. as if the local time was UTC). Takes and returns an
+        int64 array when numpy is available, lists otherwise.
+        """
+        if not len(utc_seconds):
+            return utc_seconds
+        if NUMPY_AVAILABLE:
+            transitions, offsets = cls._utc_offset_table(int(utc_seconds.min()), int(utc_seconds.max()))
+            return utc_seconds + np.array(offsets, dtype=np.int64)[np.searchsorted(transitions, utc_seconds, side='right')]
+
+        transitions, offsets = cls._utc_offset_table(min(utc_seconds), max(utc_seconds))
+        if not transitions:
+            offset = offsets[0]
+            return [sec + offset for sec in utc_seconds]
+        return [sec + offsets[bisect_right(transitions, sec)] for sec in utc_seconds]
+
+    @staticmethod
+    def _seconds_to_datetime(sec):
+        """Convert seconds since epoch to naive datetime."""
+        return datetime(1970, 1, 1) + timedelta(seconds=sec)
+
+    @property
+    def events(self):
+        """List of events, a streamed events file is loaded on first access."""
+        if self._events is None:
+            self._events = self._load_json(self._events_file)
+        return self._events
+
+    @events.setter
+    def events(self, events):
+        self._events = events
+        # Columns cached by _event_columns() were extracted from the previous events
+        self._columns = None
+
+    def iter_events(self):
+        """Iterate over events, streamed from the events file if they are not loaded."""
+        if self._events is not None:
+            yield from self._events
+            return
+        with open(self._events_file, 'rb') as f:
+            yield from ijson.items(f, 'item')
 
     def calculate_all_statistics(self):
         """Calculate all statistics and return results."""
+        counts = self._aggregate_all()
         stats = {
-            'total_events': len(self.events),
-            'by_type': self._stats_by_type(),
-            'by_subtype': self._stats_by_subtype(),
-            'by_month': self._stats_by_month(),
-            'by_quarter': self._stats_by_quarter(),
-            'by_state': self._stats_by_state(),
-            'by_day_of_week': self._stats_by_day_of_week(),
-            'by_hour': self._stats_by_hour(),
-            'zoc_events': self._stats_zoc(),
+            'total_events': counts['total'],
+            'by_type': self._stats_by_type(counts['type']),
+            'by_subtype': self._stats_by_subtype(counts['subtype']),
+            'by_month': self._stats_by_month(counts['month'], counts['min_date'], counts['max_date']),
+            'by_quarter': self._stats_by_quarter(counts['quarter'], counts['min_date'], counts['max_date']),
+            'by_state': self._stats_by_state(counts['state']),
+            'by_day_of_week': self._stats_by_day_of_week(counts['day_of_week']),
+            'by_hour': self._stats_by_hour(counts['hour']),
+            'zoc_events': self._stats_zoc(counts['zoc'], counts['total']),
         }
         return stats
 
-    def _stats_by_type(self):
-        """Count events by type."""
+    def _event_columns(self):
+        """
+        Extract the event fields used by the statistics into columns (lists), in
+        a single pass over the events. Computed once and cached until events are
+        replaced, repeated calculations don't walk (or stream) the events again.
+        """
+        if self._columns is not None:
+            return self._columns
+
+        type_ids = []
+        subtype_ids = []
+        state_ids = []
+        zoc_count = 0
+        report_times = []
+
+        # Local names avoid attribute lookups in the loop
+        add_type_id = type_ids.append
+        add_subtype_id = subtype_ids.append
+        add_state_id = state_ids.append
+        add_report_time = report_times.append
+
+        for event in self.iter_events():
+            add_type_id(event.get('typId'))
+            add_subtype_id(event.get('podtypId'))
+            add_state_id(event.get('stavId'))
+            if event.get('zoc', False):
+                zoc_count += 1
+
+            report_time = event.get('casOhlaseni')
+            if report_time:
+                add_report_time(report_time)
+
+        self._columns = {
+            'type_id': type_ids,
+            'subtype_id': subtype_ids,
+            'state_id': state_ids,
+            'zoc_count': zoc_count,
+            # Only events that have a report time
+            'report_time': report_times,
+        }
+        return self._columns
+
+    def _aggregate_all(self):
+        """Count events for all statistics from the event columns."""
+        columns = self._event_columns()
+
+        # Ids are counted per distinct id (combination), names are looked up
+        # once per distinct id
+        # Several ids may share a name, so counts are added up per name
         type_counts = Counter()
-        for event in self.events:
-            type_id = event.get('typId')
-            type_name = self.types.get(type_id, f'Unknown ({type_id})')
-            type_counts[type_name] += 1
-        return dict(sorted(type_counts.items(), key=lambda x: x[1], reverse=True))
-
-    def _stats_by_subtype(self):
-        """Count events by subtype, grouped by type."""
-        subtype_stats = defaultdict(Counter)
-        for event in self.events:
-            type_id = event.get('typId')
-            subtype_id = event.get('podtypId')
+        subtype_counts = defaultdict(Counter)
+        for (type_id, subtype_id), count in self._count_ids(columns['type_id'], columns['subtype_id']).items():
             type_name = self.types.get(type_id, f'Unknown ({type_id})')
-            subtype_name = self.subtypes.get(subtype_id, f'Unknown ({subtype_id})')
-            subtype_stats[type_name][subtype_name] += 1
+            type_counts[type_name] += count
+            subtype_counts[type_name][self.subtypes.get(subtype_id, f'Unknown ({subtype_id})')] += count
+        state_counts = Counter()
+        for (state_id,), count in self._count_ids(columns['state_id']).items():
+            state_counts[self.states.get(state_id, f'Unknown ({state_id})')] += count
+
+        # Report times parsed at once and converted to Czech local time
+        local_seconds = self._to_local_seconds(self._parse_timestamps(columns['report_time']))
+        month_counts, quarter_counts, day_counts, hour_counts = self._bucket_dates(local_seconds)
+        if not len(local_seconds):
+            min_date = max_date = None
+        elif NUMPY_AVAILABLE:
+            min_date = self._seconds_to_datetime(int(local_seconds.min()))
+            max_date = self._seconds_to_datetime(int(local_seconds.max()))
+        else:
+            min_date = self._seconds_to_datetime(min(local_seconds))
+            max_date = self._seconds_to_datetime(max(local_seconds))
+
+        return {
+            'total': len(columns['type_id']),
+            'type': type_counts,
+            'subtype': subtype_counts,
+            'state': state_counts,
+            'month': month_counts,
+            'quarter': quarter_counts,
+            'day_of_week': day_counts,
+            'hour': hour_counts,
+            'zoc': columns['zoc_count'],
+            'min_date': min_date,
+            'max_date': max_date,
+        }
+
+    @staticmethod
+    def _count_ids(*id_columns):
+        """
+        Count combinations of ids from one or two parallel lists of ids.
 
+        Returns {ids tuple: count} in order of first occurrence, same as
+        Counter(zip(*id_columns)). Non-negative integer ids are counted with
+        numpy when it is available.
+        """
+        if NUMPY_AVAILABLE and id_columns[0]:
+            ids = np.array(id_columns)
+            # Missing (None) or non-integer ids give a non-integer array
+            if ids.dtype.kind in 'iu' and ids.min() >= 0 and ids.max() < 2 ** 31:
+                ids = ids.astype(np.int64)
+                # One int64 key per combination
+                keys = ids[0]
+                for column in ids[1:]:
+                    keys = keys << 31 | column
+                _, first, counts = np.unique(keys, return_index=True, return_counts=True)
+                order = np.argsort(first)
+                # Keys are taken from the original lists, by index of first occurrence
+                return {tuple(column[i] for column in id_columns): count
+                        for i, count in zip(first[order].tolist(), counts[order].tolist())}
+        return Counter(zip(*id_columns))
+
+    def _bucket_dates(self, local_seconds):
+        """Count local report times (seconds since epoch) by month, quarter, day of week and hour."""
+        if NUMPY_AVAILABLE and len(local_seconds):
+            return self._bucket_dates_vectorized(local_seconds)
+
+        month_counts = Counter()
+        quarter_counts = Counter()
+        day_counts = Counter()
+        hour_counts = Counter()
+        # Month (year * 100 + month) and quarter (year * 10 + quarter) keys per day,
+        # many events share the same day
+        day_keys = {}
+        for sec in local_seconds:
+            days = sec // 86400
+            keys = day_keys.get(days)
+            if keys is None:
+                day = date(1970, 1, 1) + timedelta(days=days)
+                keys = day_keys[days] = (day.year * 100 + day.month, day.year * 10 + (day.month - 1) // 3 + 1)
+            month_counts[keys[0]] += 1
+            quarter_counts[keys[1]] += 1
+            # 1970-01-01 was a Thursday (weekday 3)
+            day_counts[(days + 3) % 7] += 1
+            hour_counts[sec // 3600 % 24] += 1
+        return month_counts, quarter_counts, day_counts, hour_counts
+
+    def _bucket_dates_vectorized(self, local_seconds):
+        """Same as _bucket_dates for an int64 array, counted with numpy bincount."""
+        days = local_seconds // 86400
+        # Months since 1970-01
+        months = days.astype('datetime64[D]').astype('datetime64[M]').astype(np.int64)
+        first_month = int(months.min())
+
+        hours = np.bincount(local_seconds // 3600 % 24, minlength=24)
+        # 1970-01-01 was a Thursday (weekday 3)
+        weekdays = np.bincount((days + 3) % 7, minlength=7)
+
+        month_counts = Counter()
+        quarter_counts = Counter()
+        for i, count in enumerate(np.bincount(months - first_month).tolist()):
+            if count:
+                year, month = divmod(1970 * 12 + first_month + i, 12)
+                month_counts[year * 100 + month + 1] = count
+                quarter_counts[year * 10 + month // 3 + 1] += count
+        day_counts = Counter(dict(enumerate(weekdays.tolist())))
+        hour_counts = Counter(dict(enumerate(hours.tolist())))
+        return month_counts, quarter_counts, day_counts, hour_counts
+
+    def _stats_by_type(self, type_counts):
+        """Sort event counts by type."""
+        return dict(type_counts.most_common())
+
+    def _stats_by_subtype(self, subtype_counts):
+        """Sort event counts by subtype, grouped by type."""
         # Convert to regular dict and sort
         result = {}
-        for type_name in sorted(subtype_stats.keys()):
-            result[type_name] = dict(sorted(
-                subtype_stats[type_name].items(),
-                key=lambda x: x[1],
-                reverse=True
-            ))
+        for type_name in sorted(subtype_counts.keys()):
+            result[type_name] = dict(subtype_counts[type_name].most_common())
         return result
 
-    def _stats_by_month(self):
-        """Count events by month."""
-        if not self.events:
-            return {}
-
-        # Find date range
-        dates = [self._parse_datetime(e.get('casOhlaseni')) for e in self.events]
-        dates = [d for d in dates if d]
-        if not dates:
+    def _stats_by_month(self, month_counts, min_date, max_date):
+        """
+        Fill in event counts for all months between min_date and max_date,
+        month_counts are keyed by year * 100 + month.
+        """
+        if min_date is None:
             return {}
 
-        min_date = min(dates)
-        max_date = max(dates)
-
-        # Count events by month
-        month_counts = defaultdict(int)
-        for event in self.events:
-            dt = self._parse_datetime(event.get('casOhlaseni'))
-            if dt:
-                month_key = dt.strftime('%Y-%m')
-                month_counts[month_key] += 1
-
-        # Fill in all months in the range
         result = {}
-        current = min_date.replace(day=1)
-        while current <= max_date:
-            month_key = current.strftime('%Y-%m')
-            result[month_key] = month_counts.get(month_key, 0)
-            # Move to next month
-            if current.month == 12:
-                current = current.replace(year=current.year + 1, month=1)
-            else:
-                current = current.replace(month=current.month + 1)
+        for month_index in range(min_date.year * 12 + min_date.month - 1, max_date.year * 12 + max_date.month):
+            year, month = divmod(month_index, 12)
+            result[f'{year:04d}-{month + 1:02d}'] = month_counts.get(year * 100 + month + 1, 0)
 
         return result
 
-    def _stats_by_quarter(self):
-        """Count events by quarter."""
-        if not self.events:
-            return {}
-
-        # Find date range
-        dates = [self._parse_datetime(e.get('casOhlaseni')) for e in self.events]
-        dates = [d for d in dates if d]
-        if not dates:
+    def _stats_by_quarter(self, quarter_counts, min_date, max_date):
+        """
+        Fill in event counts for all quarters between min_date and max_date,
+        quarter_counts are keyed by year * 10 + quarter.
+        """
+        if min_date is None:
             return {}
 
-        min_date = min(dates)
-        max_date = max(dates)
-
-        # Count events by quarter
-        quarter_counts = defaultdict(int)
-        for event in self.events:
-            dt = self._parse_datetime(event.get('casOhlaseni'))
-            if dt:
-                quarter = (dt.month - 1) // 3 + 1
-                quarter_key = f'{dt.year}-Q{quarter}'
-                quarter_counts[quarter_key] += 1
-
-        # Fill in all quarters in the range
         result = {}
-        current_year = min_date.year
-        current_quarter = (min_date.month - 1) // 3 + 1
-        max_year = max_date.year
-        max_quarter = (max_date.month - 1) // 3 + 1
-
-        while current_year < max_year or (current_year == max_year and current_quarter <= max_quarter):
-            quarter_key = f'{current_year}-Q{current_quarter}'
-            result[quarter_key] = quarter_counts.get(quarter_key, 0)
-            current_quarter += 1
-            if current_quarter > 4:
-                current_quarter = 1
-                current_year += 1
+        for quarter_index in range(min_date.year * 4 + (min_date.month - 1) // 3,
+                                   max_date.year * 4 + (max_date.month - 1) // 3 + 1):
+            year, quarter = divmod(quarter_index, 4)
+            result[f'{year}-Q{quarter + 1}'] = quarter_counts.get(year * 10 + quarter + 1, 0)
 
         return result
 
-    def _stats_by_state(self):
-        """Count events by state (stavId)."""
-        state_counts = Counter()
-        for event in self.events:
-            state_id = event.get('stavId')
-            state_name = self.states.get(state_id, f'Unknown ({state_id})')
-            state_counts[state_name] += 1
-        return dict(sorted(state_counts.items(), key=lambda x: x[1], reverse=True))
-
-    def _stats_by_day_of_week(self):
-        """Count events by day of week."""
+    def _stats_by_state(self, state_counts):
+        """Sort event counts by state (stavId)."""
+        return dict(state_counts.most_common())
+
+    def _stats_by_day_of_week(self, day_counts):
+        """Event counts by day of week (keyed by weekday number) in week order."""
         day_names = ['Pondělí', 'Úterý', 'Středa', 'Čtvrtek', 'Pátek', 'Sobota', 'Neděle']
-        day_counts = defaultdict(int)
-        for event in self.events:
-            dt = self._parse_datetime(event.get('casOhlaseni'))
-            if dt:
-                day_counts[day_names[dt.weekday()]] += 1
-
-        # Return in week order
-        return {day: day_counts[day] for day in day_names}
-
-    def _stats_by_hour(self):
-        """Count events by hour of day."""
-        hour_counts = defaultdict(int)
-        for event in self.events:
-            dt = self._parse_datetime(event.get('casOhlaseni'))
-            if dt:
-                hour_counts[dt.hour] += 1
-
-        # Return all 24 hours with counts (0-23)
+        return {day: day_counts[i] for i, day in enumerate(day_names)}
+
+    def _stats_by_hour(self, hour_counts):
+        """Event counts for all 24 hours of day (0-23)."""
         return {hour: hour_counts.get(hour, 0) for hour in range(24)}
 
-    def _stats_zoc(self):
-        """Count ZOC (special response) events."""
-        zoc_count = sum(1 for event in self.events if event.get('zoc', False))
+    def _stats_zoc(self, zoc_count, total):
+        """Summarize ZOC (special response) events."""
         return {
             'total_zoc': zoc_count,
-            'total_non_zoc': len(self.events) - zoc_count,
-            'percentage_zoc': round(zoc_count / len(self.events) * 100, 2) if self.events else 0
+            'total_non_zoc': total - zoc_count,
+            'percentage_zoc': round(zoc_count / total * 100, 2) if total else 0
         }
 
     def print_statistics(self, stats):
@@ -443,8 +735,10 @@ class EventStatistics:
         print("\n" + "-" * 80)
         print("ROZLOŽENÍ PO HODINÁCH")
         print("-" * 80)
+        # Avoid division by zero when there are no report times
+        max_hour = max(stats['by_hour'].values(), default=0) or 1
         for hour, count in stats['by_hour'].items():
-            bar = '█' * int(count / max(stats['by_hour'].values()) * 40) if stats['by_hour'].values() else ''
+            bar = '█' * int(count / max_hour * 40)
             print(f"{hour:02d}:00 {count:>5} {bar}")
 
         print("\n" + "-" * 80)
@@ -463,57 +757,64 @@ class EventStatistics:
 
         print("\n" + "=" * 80)
 
-    def export_to_csv(self, stats, output_dir='.'):
-        """Export statistics to CSV files."""
+    def export_to_csv(self, stats, output_dir='.', compression=None):
+        """Export statistics to CSV files, gzip compressed (.csv.gz) if compression is 'gzip'."""
         output_path = Path(output_dir)
 
+        def open_csv(name):
+            if compression == 'gzip':
+                return gzip.open(output_path / f'{name}.csv.gz', 'wt', newline='', encoding='utf-8')
+            return open(output_path / f'{name}.csv', 'w', newline='', encoding='utf-8')
+
         # Export by type
-        with open(output_path / 'stats_by_type.csv', 'w', newline='', encoding='utf-8') as f:
+        with open_csv('stats_by_type') as f:
             writer = csv.writer(f)
             writer.writerow(['Typ', 'Počet'])
-            for type_name, count in stats['by_type'].items():
-                writer.writerow([type_name, count])
+            writer.writerows(stats['by_type'].items())
 
         # Export by subtype
-        with open(output_path / 'stats_by_subtype.csv', 'w', newline='', encoding='utf-8') as f:
+        with open_csv('stats_by_subtype') as f:
             writer = csv.writer(f)
             writer.writerow(['Typ', 'Podtyp', 'Počet'])
-            for type_name, subtypes in stats['by_subtype'].items():
-                for subtype_name, count in subtypes.items():
-                    writer.writerow([type_name, subtype_name, count])
+            writer.writerows((type_name, subtype_name, count)
+                             for type_name, subtypes in stats['by_subtype'].items()
+                             for subtype_name, count in subtypes.items())
 
         # Export monthly
-        with open(output_path / 'stats_by_month.csv', 'w', newline='', encoding='utf-8') as f:
+        with open_csv('stats_by_month') as f:
             writer = csv.writer(f)
             writer.writerow(['Měsíc', 'Počet'])
-            for month, count in stats['by_month'].items():
-                writer.writerow([month, count])
+            writer.writerows(stats['by_month'].items())
 
         # Export hourly
-        with open(output_path / 'stats_by_hour.csv', 'w', newline='', encoding='utf-8') as f:
+        with open_csv('stats_by_hour') as f:
             writer = csv.writer(f)
             writer.writerow(['Hodina', 'Počet'])
-            for hour, count in stats['by_hour'].items():
-                writer.writerow([hour, count])
+            writer.writerows(stats['by_hour'].items())
 
         # Export by state
-        with open(output_path / 'stats_by_state.csv', 'w', newline='', encoding='utf-8') as f:
+        with open_csv('stats_by_state') as f:
             writer = csv.writer(f)
             writer.writerow(['Stav', 'Počet'])
-            for state_name, count in stats['by_state'].items():
-                writer.writerow([state_name, count])
+            writer.writerows(stats['by_state'].items())
 
         print(f"\nCSV soubory exportovány do: {output_path.absolute()}")
 
     def export_to_json(self, stats, filename='statistics.json'):
         """Export all statistics to a JSON file."""
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(stats, f, ensure_ascii=False, indent=2)
+        self._save_json(filename, stats)
         print(f"\nJSON exportován do: {Path(filename).absolute()}")
 
-    def export_plots(self, stats, output_dir='.'):
-        """Generate and export plots as PNG images."""
-        if not MATPLOTLIB_AVAILABLE:
+    def export_plots(self, stats, output_dir='.', fast=False, workers=1):
+        """
+        Generate and export plots as PNG images, with fast compression if fast is set.
+
+        With workers > 1 the plots are split between that many worker processes.
+        Each of them imports matplotlib again, which only pays off on multiple
+        cores, and with the spawn start method the calling script needs an
+        if __name__ == '__main__' guard.
+        """
+        if _import_pyplot() is None:
             print("\nChyba: matplotlib není nainstalován. Pro vytvoření grafů nainstalujte matplotlib:", file=sys.stderr)
             print("  pip install matplotlib", file=sys.stderr)
             return
@@ -521,256 +822,334 @@ class EventStatistics:
         output_path = Path(output_dir)
         output_path.mkdir(exist_ok=True)
 
-        # Set Czech font if available, otherwise use default
-        plt.rcParams['font.family'] = 'DejaVu Sans'
-        plt.rcParams['font.size'] = 10
-
         print("\nGeneruji grafy...")
 
-        # 1. Events by Type - Horizontal Bar Chart
+        # (filename, figure size, drawing function, data) for each plot
+        plots = []
         if stats['by_type']:
-            fig, ax = plt.subplots(figsize=(10, 6))
-            types = list(stats['by_type'].keys())
-            counts = list(stats['by_type'].values())
-            colors = plt.cm.Set3(range(len(types)))
-
-            bars = ax.barh(types, counts, color=colors)
-            ax.set_xlabel('Počet událostí')
-            ax.set_title('Události podle typu', fontsize=14, fontweight='bold')
-            ax.grid(axis='x', alpha=0.3)
-
-            # Add count labels on bars
-            for bar in bars:
-                width = bar.get_width()
-                ax.text(width, bar.get_y() + bar.get_height()/2,
-                       f' {int(width)}', ha='left', va='center')
-
-            plt.tight_layout()
-            plt.savefig(output_path / 'graf_typy.png', dpi=150, bbox_inches='tight')
-            plt.close()
-            print(f"  ✓ graf_typy.png")
-
-        # 2. Monthly Distribution - Line Chart
+            plots.append(('graf_typy.png', (10, 6), self._plot_types, self._plot_data(stats['by_type'])))
         if stats['by_month']:
-            fig, ax = plt.subplots(figsize=(12, 6))
-            months = list(stats['by_month'].keys())
-            counts = list(stats['by_month'].values())
-
-            ax.plot(months, counts, marker='o', linewidth=2, markersize=8, color='#2E86AB')
-            ax.fill_between(range(len(months)), counts, alpha=0.3, color='#2E86AB')
-            ax.set_xlabel('Měsíc')
-            ax.set_ylabel('Počet událostí')
-            ax.set_title('Rozložení událostí po měsících', fontsize=14, fontweight='bold')
-            ax.grid(True, alpha=0.3)
-            plt.xticks(rotation=45, ha='right')
-
-            # Add value labels on points
-            for i, count in enumerate(counts):
-                ax.text(i, count, f' {count}', ha='left', va='bottom')
-
-            plt.tight_layout()
-            plt.savefig(output_path / 'graf_mesice.png', dpi=150, bbox_inches='tight')
-            plt.close()
-            print(f"  ✓ graf_mesice.png")
-
-        # 3. Quarterly Distribution - Bar Chart
+            plots.append(('graf_mesice.png', (12, 6), self._plot_months, self._plot_data(stats['by_month'])))
         if stats['by_quarter']:
-            fig, ax = plt.subplots(figsize=(10, 6))
-            quarters = list(stats['by_quarter'].keys())
-            counts = list(stats['by_quarter'].values())
-
-            bars = ax.bar(quarters, counts, color='#A23B72', width=0.6)
-            ax.set_xlabel('Čtvrtletí')
-            ax.set_ylabel('Počet událostí')
-            ax.set_title('Rozložení událostí po čtvrtletích', fontsize=14, fontweight='bold')
-            ax.grid(axis='y', alpha=0.3)
-
-            # Add count labels on bars
-            for bar in bars:
-                height = bar.get_height()
-                ax.text(bar.get_x() + bar.get_width()/2, height,
-                       f'{int(height)}', ha='center', va='bottom')
-
-            plt.tight_layout()
-            plt.savefig(output_path / 'graf_ctvrtleti.png', dpi=150, bbox_inches='tight')
-            plt.close()
-            print(f"  ✓ graf_ctvrtleti.png")
-
-        # 4. Day of Week Distribution - Bar Chart
+            plots.append(('graf_ctvrtleti.png', (10, 6), self._plot_quarters, self._plot_data(stats['by_quarter'])))
         if stats['by_day_of_week']:
-            fig, ax = plt.subplots(figsize=(10, 6))
-            days = list(stats['by_day_of_week'].keys())
-            counts = list(stats['by_day_of_week'].values())
-            colors_week = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7', '#DFE6E9', '#A8E6CF']
-
-            bars = ax.bar(days, counts, color=colors_week)
-            ax.set_xlabel('Den v týdnu')
-            ax.set_ylabel('Počet událostí')
-            ax.set_title('Rozložení událostí po dnech v týdnu', fontsize=14, fontweight='bold')
-            ax.grid(axis='y', alpha=0.3)
-            plt.xticks(rotation=45, ha='right')
-
-            # Add count labels
-            for bar in bars:
-                height = bar.get_height()
-                ax.text(bar.get_x() + bar.get_width()/2, height,
-                       f'{int(height)}', ha='center', va='bottom')
-
-            plt.tight_layout()
-            plt.savefig(output_path / 'graf_dny.png', dpi=150, bbox_inches='tight')
-            plt.close()
-            print(f"  ✓ graf_dny.png")
-
-        # 5. Hourly Distribution - Bar Chart
+            plots.append(('graf_dny.png', (10, 6), self._plot_days, self._plot_data(stats['by_day_of_week'])))
         if stats['by_hour']:
-            fig, ax = plt.subplots(figsize=(14, 6))
-            hours = list(stats['by_hour'].keys())
-            counts = list(stats['by_hour'].values())
-
-            # Color bars based on value (gradient)
-            colors_hourly = plt.cm.YlOrRd([c/max(counts) if max(counts) > 0 else 0 for c in counts])
-
-            bars = ax.bar(hours, counts, color=colors_hourly, width=0.8)
-            ax.set_xlabel('Hodina')
-            ax.set_ylabel('Počet událostí')
-            ax.set_title('Rozložení událostí po hodinách', fontsize=14, fontweight='bold')
-            ax.set_xticks(range(0, 24, 2))
-            ax.set_xticklabels([f'{h}:00' for h in range(0, 24, 2)])
-            ax.grid(axis='y', alpha=0.3)
-
-            plt.tight_layout()
-            plt.savefig(output_path / 'graf_hodiny.png', dpi=150, bbox_inches='tight')
-            plt.close()
-            print(f"  ✓ graf_hodiny.png")
-
-        # 6. Subtypes Distribution - Horizontal Bar Chart
+            plots.append(('graf_hodiny.png', (14, 6), self._plot_hours, self._plot_data(stats['by_hour'])))
         if stats['by_subtype']:
-            # Flatten subtypes from all types and get top ones
-            all_subtypes = []
-            for type_name, subtypes in stats['by_subtype'].items():
-                for subtype_name, count in subtypes.items():
-                    all_subtypes.append((subtype_name, count, type_name))
-
-            # Sort by count and take top 15
-            all_subtypes.sort(key=lambda x: x[1], reverse=True)
-            top_subtypes = all_subtypes[:15]
-
+            # Top 15 subtypes from all types, without sorting all of them
+            top_subtypes = heapq.nlargest(
+                15,
+                ((subtype_name, count, type_name)
+                 for type_name, subtypes in stats['by_subtype'].items()
+                 for subtype_name, count in subtypes.items()),
+                key=lambda x: x[1]
+            )
             if top_subtypes:
-                fig, ax = plt.subplots(figsize=(12, 10))
-
-                subtype_names = [item[0] for item in top_subtypes]
-                counts = [item[1] for item in top_subtypes]
-                type_names = [item[2] for item in top_subtypes]
-
-                # Create color map based on parent type
-                unique_types = list(dict.fromkeys(type_names))
-                type_colors = {t: plt.cm.Set3(i/len(unique_types)) for i, t in enumerate(unique_types)}
-                colors = [type_colors[t] for t in type_names]
-
-                bars = ax.barh(subtype_names, counts, color=colors)
-                ax.set_xlabel('Počet událostí')
-                ax.set_title('Top 15 podtypů událostí', fontsize=14, fontweight='bold')
-                ax.grid(axis='x', alpha=0.3)
-
-                # Add count labels
-                for bar in bars:
-                    width = bar.get_width()
-                    ax.text(width, bar.get_y() + bar.get_height()/2,
-                           f' {int(width)}', ha='left', va='center')
-
-                # Add legend for types
-                from matplotlib.patches import Patch
-                legend_elements = [Patch(facecolor=type_colors[t], label=t)
-                                 for t in unique_types]
-                ax.legend(handles=legend_elements, loc='lower right', fontsize=9)
-
-                plt.tight_layout()
-                plt.savefig(output_path / 'graf_podtypy.png', dpi=150, bbox_inches='tight')
-                plt.close()
-                print(f"  ✓ graf_podtypy.png")
-
-        # 7. Top States - Horizontal Bar Chart
+                plots.append(('graf_podtypy.png', (12, 10), self._plot_subtypes, top_subtypes))
         if stats['by_state']:
-            fig, ax = plt.subplots(figsize=(12, 8))
             # Take top 10 states
-            items = list(stats['by_state'].items())[:10]
-            states = [item[0] for item in items]
-            counts = [item[1] for item in items]
-
-            colors = plt.cm.viridis(range(len(states)))
-            bars = ax.barh(states, counts, color=colors)
-            ax.set_xlabel('Počet událostí')
-            ax.set_title('Události podle stavu (top 10)', fontsize=14, fontweight='bold')
-            ax.grid(axis='x', alpha=0.3)
-
-            # Add count labels
-            for bar in bars:
-                width = bar.get_width()
-                ax.text(width, bar.get_y() + bar.get_height()/2,
-                       f' {int(width)}', ha='left', va='center')
-
-            plt.tight_layout()
-            plt.savefig(output_path / 'graf_stavy.png', dpi=150, bbox_inches='tight')
-            plt.close()
-            print(f"  ✓ graf_stavy.png")
+            plots.append(('graf_stavy.png', (12, 8), self._plot_states, self._plot_data(dict(islice(stats['by_state'].items(), 10)))))
+
+        workers = min(len(plots), workers)
+        if workers > 1:
+            # Rendering is CPU bound and the plots are independent, split them between processes
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(_render_plots, [output_path] * workers,
+                                  [plots[i::workers] for i in range(workers)], [fast] * workers))
+            for filename, *_ in plots:
+                print(f"  ✓ {filename}")
+        else:
+            _render_plots(output_path, plots, fast, verbose=True)
 
         print(f"\nGrafy uloženy do: {output_path.absolute()}")
 
+    @staticmethod
+    def _plot_data(counts):
+        """
+        Split a label -> count dict into (labels, counts) plot data, counts as
+        a numpy array when numpy is available so matplotlib doesn't convert them.
+        """
+        if NUMPY_AVAILABLE:
+            return tuple(counts), np.fromiter(counts.values(), dtype=np.int64, count=len(counts))
+        return tuple(counts), tuple(counts.values())
+
+    @staticmethod
+    def _plot_types(ax, data):
+        """Events by type - horizontal bar chart."""
+        plt = _import_pyplot()
+        types, counts = data
+        colors = plt.cm.Set3(range(len(types)))
+
+        bars = ax.barh(types, counts, color=colors)
+        ax.set_xlabel('Počet událostí')
+        ax.set_title('Události podle typu', fontsize=14, fontweight='bold')
+        ax.grid(axis='x', alpha=0.3)
+
+        # Add count labels on bars
+        for bar in bars:
+            width = bar.get_width()
+            ax.text(width, bar.get_y() + bar.get_height()/2,
+                   f' {int(width)}', ha='left', va='center')
+
+    @staticmethod
+    def _plot_months(ax, data):
+        """Monthly distribution - line chart."""
+        plt = _import_pyplot()
+        months, counts = data
+
+        ax.plot(months, counts, marker='o', linewidth=2, markersize=8, color='#2E86AB')
+        ax.fill_between(range(len(months)), counts, alpha=0.3, color='#2E86AB')
+        ax.set_xlabel('Měsíc')
+        ax.set_ylabel('Počet událostí')
+        ax.set_title('Rozložení událostí po měsících', fontsize=14, fontweight='bold')
+        ax.grid(True, alpha=0.3)
+        plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
+
+        # Add value labels on points
+        for i, count in enumerate(counts):
+            ax.text(i, count, f' {count}', ha='left', va='bottom')
+
+    @staticmethod
+    def _plot_quarters(ax, data):
+        """Quarterly distribution - bar chart."""
+        quarters, counts = data
+
+        bars = ax.bar(quarters, counts, color='#A23B72', width=0.6)
+        ax.set_xlabel('Čtvrtletí')
+        ax.set_ylabel('Počet událostí')
+        ax.set_title('Rozložení událostí po čtvrtletích', fontsize=14, fontweight='bold')
+        ax.grid(axis='y', alpha=0.3)
+
+        # Add count labels on bars
+        for bar in bars:
+            height = bar.get_height()
+            ax.text(bar.get_x() + bar.get_width()/2, height,
+                   f'{int(height)}', ha='center', va='bottom')
+
+    @staticmethod
+    def _plot_days(ax, data):
+        """Day of week distribution - bar chart."""
+        plt = _import_pyplot()
+        days, counts = data
+        colors_week = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7', '#DFE6E9', '#A8E6CF']
+
+        bars = ax.bar(days, counts, color=colors_week)
+        ax.set_xlabel('Den v týdnu')
+        ax.set_ylabel('Počet událostí')
+        ax.set_title('Rozložení událostí po dnech v týdnu', fontsize=14, fontweight='bold')
+        ax.grid(axis='y', alpha=0.3)
+        plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
+
+        # Add count labels
+        for bar in bars:
+            height = bar.get_height()
+            ax.text(bar.get_x() + bar.get_width()/2, height,
+                   f'{int(height)}', ha='center', va='bottom')
+
+    @staticmethod
+    def _plot_hours(ax, data):
+        """Hourly distribution - bar chart."""
+        plt = _import_pyplot()
+        hours, counts = data
+
+        # Color bars based on value (gradient)
+        vmax = max(counts) or 1
+        colors_hourly = plt.cm.YlOrRd([c / vmax for c in counts])
+
+        ax.bar(hours, counts, color=colors_hourly, width=0.8)
+        ax.set_xlabel('Hodina')
+        ax.set_ylabel('Počet událostí')
+        ax.set_title('Rozložení událostí po hodinách', fontsize=14, fontweight='bold')
+        ax.set_xticks(range(0, 24, 2))
+        ax.set_xticklabels([f'{h}:00' for h in range(0, 24, 2)])
+        ax.grid(axis='y', alpha=0.3)
+
+    @staticmethod
+    def _plot_subtypes(ax, top_subtypes):
+        """Top subtypes - horizontal bar chart colored by type."""
+        plt = _import_pyplot()
+        from matplotlib.patches import Patch
+
+        subtype_names, counts, type_names = zip(*top_subtypes)
+
+        # Create color map based on parent type
+        unique_types = list(dict.fromkeys(type_names))
+        type_colors = {t: plt.cm.Set3(i/len(unique_types)) for i, t in enumerate(unique_types)}
+        colors = [type_colors[t] for t in type_names]
+
+        bars = ax.barh(subtype_names, counts, color=colors)
+        ax.set_xlabel('Počet událostí')
+        ax.set_title('Top 15 podtypů událostí', fontsize=14, fontweight='bold')
+        ax.grid(axis='x', alpha=0.3)
+
+        # Add count labels
+        for bar in bars:
+            width = bar.get_width()
+            ax.text(width, bar.get_y() + bar.get_height()/2,
+                   f' {int(width)}', ha='left', va='center')
+
+        # Add legend for types
+        legend_elements = [Patch(facecolor=type_colors[t], label=t)
+                         for t in unique_types]
+        ax.legend(handles=legend_elements, loc='lower right', fontsize=9)
+
+    @staticmethod
+    def _plot_states(ax, data):
+        """Top states - horizontal bar chart."""
+        plt = _import_pyplot()
+        states, counts = data
+
+        colors = plt.cm.viridis(range(len(states)))
+        bars = ax.barh(states, counts, color=colors)
+        ax.set_xlabel('Počet událostí')
+        ax.set_title('Události podle stavu (top 10)', fontsize=14, fontweight='bold')
+        ax.grid(axis='x', alpha=0.3)
+
+        # Add count labels
+        for bar in bars:
+            width = bar.get_width()
+            ax.text(width, bar.get_y() + bar.get_height()/2,
+                   f' {int(width)}', ha='left', va='center')
+
+
+USAGE = """\
+usage: {prog} [-h] [--from DATUM] [--to DATUM] [--unit ID] [--save]
+                     [--events EVENTS] [--types TYPES] [--subtypes SUBTYPES]
+                     [--states STATES] [--export-csv]
+                     [--csv-compression {{gzip}}] [--export-json]
+                     [--export-plots] [--plot-fast]
+"""
+
+HELP = USAGE + """
+Výpočet statistik událostí hasičů
+
+options:
+  -h, --help            show this help message and exit
+
+možnosti stahování z webu:
+  --from DATUM          Počáteční datum (RRRR-MM-DD nebo RRRR-MM-
+                        DDTHH:MM:SS.SSSZ)
+  --to DATUM            Koncové datum (RRRR-MM-DD nebo RRRR-MM-
+                        DDTHH:MM:SS.SSSZ)
+  --unit ID             ID jednotky (např. 8102157)
+  --save                Uložit stažená data do lokálních JSON souborů pro
+                        pozdější použití
+
+možnosti lokálních souborů:
+  --events EVENTS       JSON soubor s událostmi (výchozí: udalosti.json)
+  --types TYPES         JSON soubor s typy (výchozí: typy.json)
+  --subtypes SUBTYPES   JSON soubor s podtypy (výchozí: podtypy.json)
+  --states STATES       JSON soubor se stavy (výchozí: stavy.json)
+
+možnosti exportu:
+  --export-csv          Exportovat statistiky do CSV souborů
+  --csv-compression {{gzip}}
+                        Komprimovat CSV soubory (gzip vytvoří soubory .csv.gz)
+  --export-json         Exportovat statistiky do JSON souboru
+  --export-plots        Vygenerovat grafy jako PNG obrázky (vyžaduje
+                        matplotlib)
+  --plot-fast           Rychlejší ukládání grafů za cenu větších PNG souborů
+
+Příklady:
+  {prog} --from 2025-01-01 --to 2025-12-31 --unit 8102157
+  {prog} --from 2025-01-01 --to 2025-12-31 --unit 8102157 --save
+  {prog} --from 2025-01-01 --to 2025-12-31 --unit 8102157 --export-csv --export-plots
+  {prog} --export-plots (použije lokální JSON soubory a vytvoří grafy)
+"""
+
+# USAGE and HELP are written by hand, update them together with the option
+# tables below whenever an option is added or changed
+
+# Command line options taking a value, mapped to argument names
+VALUE_OPTIONS = {
+    '--from': 'from_date',
+    '--to': 'to_date',
+    '--unit': 'unit_id',
+    '--events': 'events',
+    '--types': 'types',
+    '--subtypes': 'subtypes',
+    '--states': 'states',
+    '--csv-compression': 'csv_compression',
+}
+# Allowed values of options with a fixed set of values
+OPTION_CHOICES = {'--csv-compression': ('gzip',)}
+# Command line switches, mapped to argument names
+FLAG_OPTIONS = {
+    '--save': 'save',
+    '--export-csv': 'export_csv',
+    '--export-json': 'export_json',
+    '--export-plots': 'export_plots',
+    '--plot-fast': 'plot_fast',
+}
+DEFAULT_ARGS = {
+    'from_date': None,
+    'to_date': None,
+    'unit_id': None,
+    'events': 'udalosti.json',
+    'types': 'typy.json',
+    'subtypes': 'podtypy.json',
+    'states': 'stavy.json',
+    'csv_compression': None,
+    **dict.fromkeys(FLAG_OPTIONS.values(), False),
+}
+
+
+def _usage_error(message):
+    """Print usage and an error message to stderr and exit with status 2, like argparse."""
+    prog = Path(sys.argv[0]).name
+    sys.stderr.write(USAGE.format(prog=prog) + f'{prog}: error: {message}\n')
+    sys.exit(2)
+
+
+def _parse_args(argv):
+    """
+    Parse command line arguments.
+
+    A small replacement for argparse, which takes longer to import and set up
+    than parsing this handful of long options. Accepts both '--option value'
+    and '--option=value'.
+    """
+    args = SimpleNamespace(**DEFAULT_ARGS)
+    unrecognized = []
+    tokens = iter(argv)
+    for token in tokens:
+        if token in ('-h', '--help'):
+            sys.stdout.write(HELP.format(prog=Path(sys.argv[0]).name))
+            sys.exit(0)
+
+        option, has_value, value = token.partition('=')
+        if option in VALUE_OPTIONS:
+            if not has_value:
+                value = next(tokens, None)
+                if value is None or value.startswith('--'):
+                    _usage_error(f'argument {option}: expected one argument')
+            choices = OPTION_CHOICES.get(option)
+            if choices and value not in choices:
+                _usage_error(f"argument {option}: invalid choice: '{value}' "
+                             f"(choose from {', '.join(repr(choice) for choice in choices)})")
+            setattr(args, VALUE_OPTIONS[option], value)
+        elif token in FLAG_OPTIONS:
+            setattr(args, FLAG_OPTIONS[token], True)
+        else:
+            unrecognized.append(token)
+
+    if unrecognized:
+        _usage_error(f"unrecognized arguments: {' '.join(unrecognized)}")
+    return args
+
 
 def main():
     """Main function."""
-    import argparse
-
-    parser = argparse.ArgumentParser(
-        description='Výpočet statistik událostí hasičů',
-        epilog='Příklady:\n'
-               '  %(prog)s --from 2025-01-01 --to 2025-12-31 --unit 8102157\n'
-               '  %(prog)s --from 2025-01-01 --to 2025-12-31 --unit 8102157 --save\n'
-               '  %(prog)s --from 2025-01-01 --to 2025-12-31 --unit 8102157 --export-csv --export-plots\n'
-               '  %(prog)s --export-plots (použije lokální JSON soubory a vytvoří grafy)',
-        formatter_class=argparse.RawDescriptionHelpFormatter
-    )
-
-    # Web download options
-    web_group = parser.add_argument_group('možnosti stahování z webu')
-    web_group.add_argument('--from', dest='from_date', metavar='DATUM',
-                          help='Počáteční datum (RRRR-MM-DD nebo RRRR-MM-DDTHH:MM:SS.SSSZ)')
-    web_group.add_argument('--to', dest='to_date', metavar='DATUM',
-                          help='Koncové datum (RRRR-MM-DD nebo RRRR-MM-DDTHH:MM:SS.SSSZ)')
-    web_group.add_argument('--unit', dest='unit_id', metavar='ID',
-                          help='ID jednotky (např. 8102157)')
-    web_group.add_argument('--save', action='store_true',
-                          help='Uložit stažená data do lokálních JSON souborů pro pozdější použití')
-
-    # Local file options
-    file_group = parser.add_argument_group('možnosti lokálních souborů')
-    file_group.add_argument('--events', default='udalosti.json',
-                           help='JSON soubor s událostmi (výchozí: udalosti.json)')
-    file_group.add_argument('--types', default='typy.json',
-                           help='JSON soubor s typy (výchozí: typy.json)')
-    file_group.add_argument('--subtypes', default='podtypy.json',
-                           help='JSON soubor s podtypy (výchozí: podtypy.json)')
-    file_group.add_argument('--states', default='stavy.json',
-                           help='JSON soubor se stavy (výchozí: stavy.json)')
-
-    # Export options
-    export_group = parser.add_argument_group('možnosti exportu')
-    export_group.add_argument('--export-csv', action='store_true',
-                             help='Exportovat statistiky do CSV souborů')
-    export_group.add_argument('--export-json', action='store_true',
-                             help='Exportovat statistiky do JSON souboru')
-    export_group.add_argument('--export-plots', action='store_true',
-                             help='Vygenerovat grafy jako PNG obrázky (vyžaduje matplotlib)')
-
-    args = parser.parse_args()
+    args = _parse_args(sys.argv[1:])
 
     # Check if we should download from web
-    use_web = args.from_date or args.to_date or args.unit_id
+    use_web = any((args.from_date, args.to_date, args.unit_id))
 
     if use_web:
         # Validate that all web parameters are provided
         if not (args.from_date and args.to_date and args.unit_id):
-            parser.error('Při stahování z webu jsou povinné parametry --from, --to a --unit')
+            _usage_error('Při stahování z webu jsou povinné parametry --from, --to a --unit')
 
         # Download from web
         calculator = EventStatistics.from_web(args.from_date, args.to_date, args.unit_id,
@@ -780,17 +1159,20 @@ def main():
         try:
             calculator = EventStatistics(args.events, args.types, args.subtypes, args.states)
         except FileNotFoundError as e:
-            print(f"Chyba: {e}", file=sys.stderr)
-            print("\nLokální datové soubory nenalezeny. Máte dvě možnosti:\n", file=sys.stderr)
-            print("1. Stáhnout data z webu pomocí:", file=sys.stderr)
-            print(f"   python3 {sys.argv[0]} --from RRRR-MM-DD --to RRRR-MM-DD --unit ID_JEDNOTKY", file=sys.stderr)
-            print(f"\n   Příklad:", file=sys.stderr)
-            print(f"   python3 {sys.argv[0]} --from 2025-01-01 --to 2025-12-31 --unit 8102157", file=sys.stderr)
-            print("\n2. Nebo zajistit, že tyto soubory existují v aktuálním adresáři:", file=sys.stderr)
-            print(f"   - {args.events}", file=sys.stderr)
-            print(f"   - {args.types}", file=sys.stderr)
-            print(f"   - {args.subtypes}", file=sys.stderr)
-            print(f"   - {args.states}", file=sys.stderr)
+            # Written at once instead of line by line
+            sys.stderr.write('\n'.join([
+                f"Chyba: {e}",
+                "\nLokální datové soubory nenalezeny. Máte dvě možnosti:\n",
+                "1. Stáhnout data z webu pomocí:",
+                f"   python3 {sys.argv[0]} --from RRRR-MM-DD --to RRRR-MM-DD --unit ID_JEDNOTKY",
+                "\n   Příklad:",
+                f"   python3 {sys.argv[0]} --from 2025-01-01 --to 2025-12-31 --unit 8102157",
+                "\n2. Nebo zajistit, že tyto soubory existují v aktuálním adresáři:",
+                f"   - {args.events}",
+                f"   - {args.types}",
+                f"   - {args.subtypes}",
+                f"   - {args.states}",
+            ]) + '\n')
             sys.exit(1)
 
     # Calculate statistics
@@ -801,13 +1183,13 @@ def main():
 
     # Export if requested
     if args.export_csv:
-        calculator.export_to_csv(stats)
+        calculator.export_to_csv(stats, compression=args.csv_compression)
 
     if args.export_json:
         calculator.export_to_json(stats)
 
     if args.export_plots:
-        calculator.export_plots(stats)
+        calculator.export_plots(stats, fast=args.plot_fast)
 
 
 if __name__ == '__main__':